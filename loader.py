@@ -0,0 +1,270 @@
+"""
+AlcAI Node Loader
+=================
+
+Canonical registry behind the package's NODE_CLASS_MAPPINGS / NODE_DISPLAY_NAME_MAPPINGS.
+The package __init__ only re-exports from here, so there is exactly one place that
+walks `nodes_to_load`.
+
+The registry is built once per process: it is published in sys.modules under
+_REGISTRY_KEY, and a second import of the package under another name (ComfyUI can load
+custom nodes both by path and as 'custom_nodes.<name>') reuses the existing mappings
+instead of importing every node module, and registering its API routes, a second time.
+"""
+
+import importlib  # For dynamic module imports
+import importlib.util  # For resolving relative module names
+import traceback  # For detailed error tracebacks in exceptions
+import os  # For directory and file path operations
+import sys  # For the process-wide registry guard
+from concurrent.futures import ThreadPoolExecutor  # For overlapping cold-start module imports
+
+# Determine package paths
+package_dir = os.path.dirname(__file__)  # Root directory of this package
+nodes_dir = os.path.join(package_dir, "nodes")  # Subdirectory for node modules
+nodes_init_file = os.path.join(nodes_dir, "__init__.py")  # Required init file for relative imports
+
+# Node registry: (class_name, relative_module_path, display_name)
+# - class_name: The class to extract from the module.
+# - relative_module_path: Dot-separated path from 'nodes' (e.g., '.subfolder.Module').
+# - display_name: Human-readable name for UI display.
+# Add new nodes here; ensure the module exports the class and handles dependencies.
+nodes_to_load = [
+    ("AnimeCharacterSelector", ".nodes.AnimeCharacterSelector", "Anime Character Selector (API)"),
+    ("BooruImageLoader", ".nodes.BooruImageLoader", "Load Image from Booru"),
+    ("ImageLoaderEnhanced", ".nodes.ImageLoaderEnhanced", "Load Image Enhanced"),
+    ("WordShuffler", ".nodes.WordShuffler", "Text/String Shuffler"),
+    ("LogicGatesForBoolean", ".nodes.LogicGates", "Logic Gate (BOOLEAN)"),
+    ("LogicGateForAnyValue", ".nodes.LogicGates", "Logic Gate (ANY)"),
+    ("LogicGateSwitchForAnyValue", ".nodes.LogicGates", "Logic Gate (SWITCH ANY)"),
+    ("SplitTextByTokens", ".nodes.BatchTokenizeText", "Tokenize Text (batch)"),
+    ("GetTextListByIndex", ".nodes.BatchTokenizeText", "Get Text by Index"),
+    ("RandomResSDXL", ".nodes.RandomResSDXL", "SDXL Random Latent Resolution"),
+    ("ModelInfoSelector", ".nodes.ModelInfoSelector", "Checkpoint Model Selector"),
+    ("CustomWatermarkMaker", ".nodes.WatermarkNode", "Custom Watermark Writer"),
+    ("LoraNameSelector", ".nodes.LoraNameSelector", "Lora Name Selector"),
+    ("LoraLoaderAndKeywords", ".nodes.CustomLoraLoader", "Load Lora with Keywords"),
+    # Extend this list for additional nodes
+]
+
+# sys.modules key under which the first loader instance publishes itself
+_REGISTRY_KEY = "_alcai_nodes_registry"
+
+# Node modules whose API routes have already been attached to the PromptServer
+_ROUTED_MODULES = set()
+
+# Upper bound on threads used to import node modules concurrently
+_IMPORT_WORKERS = 8
+
+
+def cached_import(module_path, item_name):
+    """Return `item_name` from `module_path`, importing the module only if needed.
+
+    Several nodes share a module (LogicGates, BatchTokenizeText), so look in sys.modules
+    first and only go through the import machinery on a miss or while the module is
+    still initializing in another thread.
+    """
+    module_name = importlib.util.resolve_name(module_path, __package__)
+    module = sys.modules.get(module_name)
+    if module is None or getattr(getattr(module, "__spec__", None), "_initializing", False):
+        module = importlib.import_module(module_name)
+    return getattr(module, item_name)
+
+
+def _try_import(module_path):
+    """Import a module for its side effect of landing in sys.modules, ignoring failures."""
+    try:
+        importlib.import_module(importlib.util.resolve_name(module_path, __package__))
+    except Exception:
+        pass
+
+
+def _register_module_routes(import_path):
+    """Run a node module's `_register_routes()` hook once, if a PromptServer is running.
+
+    Node modules define their aiohttp handlers as plain functions and only attach them
+    here, so importing a node module never requires the server to be up.
+    """
+    module_name = importlib.util.resolve_name(import_path, __package__)
+    if module_name in _ROUTED_MODULES or "server" not in sys.modules:
+        return
+    register_routes = getattr(sys.modules.get(module_name), "_register_routes", None)
+    if register_routes is not None:
+        register_routes()
+    _ROUTED_MODULES.add(module_name)
+
+
+class _PendingNode:
+    """Placeholder stored in NODE_CLASS_MAPPINGS until its module is imported."""
+
+    __slots__ = ("import_path",)
+
+    def __init__(self, import_path):
+        self.import_path = import_path
+
+
+class LazyNodeMapping(dict):
+    """dict of {class_name: node_class} that imports each node module on first access.
+
+    Entries start out as placeholders; __getitem__, get() and `in` swap a placeholder for
+    the real class (importing its module) and memoize the result. Whole-mapping views
+    (keys(), items(), values(), iteration, len()) first import the pending modules on a
+    thread pool and resolve every entry, so they never list a node that fails to load;
+    such nodes are reported, then dropped from both mappings.
+    """
+
+    def __init__(self, entries, display_names):
+        super().__init__((class_name, _PendingNode(import_path)) for class_name, import_path in entries)
+        self._display_names = display_names
+
+    def __getitem__(self, class_name):
+        value = super().__getitem__(class_name)
+        if isinstance(value, _PendingNode):
+            value = self._resolve(class_name, value.import_path)
+        return value
+
+    def __iter__(self):
+        # Overriding __iter__ also keeps dict(mapping) / other.update(mapping) off the
+        # C fast path, which would otherwise copy the raw placeholders.
+        return iter(self.keys())
+
+    def __len__(self):
+        self._resolve_all()
+        return super().__len__()
+
+    def __contains__(self, class_name):
+        return self.get(class_name) is not None
+
+    def get(self, class_name, default=None):
+        try:
+            return self[class_name]
+        except KeyError:
+            return default
+
+    def keys(self):
+        self._resolve_all()
+        return list(super().keys())
+
+    def items(self):
+        self._resolve_all()
+        return list(super().items())
+
+    def values(self):
+        self._resolve_all()
+        return list(super().values())
+
+    def _resolve_all(self):
+        """Resolve every pending entry; failed nodes are reported and dropped by _resolve."""
+        self._prefetch()
+        for class_name, value in list(super().items()):
+            if isinstance(value, _PendingNode):
+                self.get(class_name)
+
+    def _prefetch(self):
+        """Import all still-pending node modules concurrently before resolving them.
+
+        The import lock still serializes module bodies, but file lookups and reads overlap
+        on a cold disk. Errors are ignored here; _resolve re-raises and reports them in
+        order on the main thread.
+        """
+        pending = {value.import_path for value in super().values() if isinstance(value, _PendingNode)}
+        if len(pending) < 2:
+            return
+        with ThreadPoolExecutor(max_workers=min(_IMPORT_WORKERS, len(pending))) as executor:
+            for import_path in pending:
+                executor.submit(_try_import, import_path)
+
+    def _resolve(self, class_name, import_path):
+        """Import the node's module, cache the class in place and report the outcome."""
+        display_name = self._display_names.get(class_name, class_name)
+        try:
+            # Resolve '.nodes.SubModule' relative to the package root and extract the class
+            node_class = cached_import(import_path, class_name)
+
+            # Attach the module's API routes now that it is imported
+            _register_module_routes(import_path)
+        except ImportError as e:
+            print(f"  ❌     Import failed for {class_name} ({import_path}): {e}")
+            print(f"         Check: File exists? Dependencies installed? 'nodes/__init__.py' present?")
+            return self._drop(class_name, e)
+        except AttributeError as e:
+            print(f"  ❌     Class '{class_name}' not found in {import_path}: {e}")
+            print(f"         Check: Class name matches in module? Exported correctly?")
+            return self._drop(class_name, e)
+        except Exception as e:
+            print(f"  ❌     Unexpected error loading {class_name}: {e}")
+            traceback.print_exc()  # Full traceback for debugging
+            return self._drop(class_name, e)
+
+        super().__setitem__(class_name, node_class)
+        print(f"  ✅     {class_name}: Loaded ({display_name})")
+        return node_class
+
+    def _drop(self, class_name, error):
+        """Forget a node that failed to load so it is not retried or advertised."""
+        super().pop(class_name, None)
+        self._display_names.pop(class_name, None)
+        raise KeyError(class_name) from error
+
+
+def _scan_node_modules():
+    """Return the names of the importable modules/packages directly under the nodes directory."""
+    present = set()
+    with os.scandir(nodes_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".py") and entry.is_file():
+                present.add(entry.name[:-3])
+            elif entry.is_dir() and os.path.isfile(os.path.join(entry.path, "__init__.py")):
+                present.add(entry.name)
+    return frozenset(present)
+
+
+def _build_mappings():
+    """Validate the nodes directory and build the (class, display name) mappings."""
+    print("\n   --- Loading AlcAI Custom Nodes ---   \n")
+
+    entries = nodes_to_load
+
+    # Validate nodes directory structure
+    if not os.path.isdir(nodes_dir):
+        print(f"⚠️   Warning: 'nodes' directory not found in {package_dir}. Skipping node loads.")
+        entries = []  # No nodes to attempt loading
+    elif not os.path.isfile(nodes_init_file):
+        print(f"⚠️   Warning: Missing __init__.py in '{nodes_dir}'. Relative imports may fail.")
+        print(f"      Tip: Create an empty __init__.py file in the 'nodes' directory.")
+        # Proceed with loads, but imports may still error later
+
+    # Scan the nodes directory once so missing modules are skipped without going through the importer
+    if entries:
+        present = _scan_node_modules()
+        missing = [entry for entry in entries if entry[1].split(".")[2] not in present]  # '.nodes.<name>[...]'
+        for class_name, import_path, _ in missing:
+            print(f"⚠️   Warning: Skipping {class_name}: no module file for {import_path} in '{nodes_dir}'.")
+        if missing:
+            entries = [entry for entry in entries if entry not in missing]
+
+    display_names = {class_name: display_name for class_name, _, display_name in entries}
+    class_mappings = LazyNodeMapping(((class_name, import_path) for class_name, import_path, _ in entries), display_names)
+
+    registered = dict.__len__(class_mappings)  # len() would resolve (import) every node
+    print("\n-----------------------------------------------------------------------------")
+    if registered:
+        print(f"  ✅   AlcAI Nodes: {registered} node(s) registered, modules load on first use.")
+    else:
+        print("  ❌   No nodes registered: Verify 'nodes' directory and __init__.py.")
+    print("-----------------------------------------------------------------------------\n")
+    return class_mappings, display_names
+
+
+# Global mappings for ComfyUI-style node registration
+_registry = sys.modules.get(_REGISTRY_KEY)
+if _registry is not None:
+    # Already loaded under another package name: share its mappings
+    NODE_CLASS_MAPPINGS = _registry.NODE_CLASS_MAPPINGS  # {class_name: node_class}
+    NODE_DISPLAY_NAME_MAPPINGS = _registry.NODE_DISPLAY_NAME_MAPPINGS  # {class_name: display_name}
+else:
+    NODE_CLASS_MAPPINGS, NODE_DISPLAY_NAME_MAPPINGS = _build_mappings()
+    sys.modules[_REGISTRY_KEY] = sys.modules[__name__]
+
+# Web extensions directory (relative to package root)
+WEB_DIRECTORY = "./web/extensions"
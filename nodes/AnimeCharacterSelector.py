@@ -1,26 +1,28 @@
-import torch
-import numpy as np
-import hashlib
 import os
-import requests
 import json
 import random
-import re
-from server import PromptServer
+from functools import lru_cache
 from aiohttp import web
 from typing import Dict, List, Set, Tuple
 from pathlib import Path
 
+try:
+    import orjson  # Optional: several times faster than stdlib json on this payload
+except ImportError:
+    orjson = None
+
 # Global configuration
 CURRENT_DIR: str = os.path.dirname(os.path.abspath(__file__))
 # JSON_FOLDER: str = os.path.join(CURRENT_DIR, "Anime_character_json")
 JSON_FOLDER: str = os.path.join(str(Path(__file__).parent.parent.resolve()), "json")
 CHARACTER_DATA_LOADED: Dict[str, List[str]] = {}  # Stores categorized character data
+_ALL_CHARACTERS_SORTED: Tuple[str, ...] = ()  # Every character across categories, sorted, without "random"
+_NO_RANDOM: Dict[str, List[str]] = {}  # Category -> selectable characters (no "random" entry)
 
 # API Endpoint
-@PromptServer.instance.routes.get("/mira/get_character_data")
 async def get_character_data_api(request: web.Request) -> web.Response:
     """Serve categorized character data via API."""
+    _ensure_loaded()
     if not CHARACTER_DATA_LOADED:
         print("[ACS Warning]: Data not loaded for /mira/get_character_data.")
         return web.json_response({"Error": "Data not loaded"}, status=503)
@@ -31,10 +33,12 @@ class AnimeCharacterSelector:
     
     def __init__(self) -> None:
         self.previous_character: str = ""
+        self._rng: random.Random = random.Random()  # Per-node RNG, independent of the global one
 
     @classmethod
     def INPUT_TYPES(cls) -> Dict[str, Dict[str, tuple]]:
         """Define input types using loaded character data."""
+        _ensure_loaded()
         if not CHARACTER_DATA_LOADED:
             print("[ACS Warning]: INPUT_TYPES called before data loaded. Using fallback.")
             return {
@@ -45,8 +49,7 @@ class AnimeCharacterSelector:
             }
         
         categories: List[str] = list(CHARACTER_DATA_LOADED.keys())
-        all_characters: Set[str] = {"random"} | {c for cat in CHARACTER_DATA_LOADED.values() for c in cat if c != "random"}
-        characters: List[str] = ["random"] + sorted(all_characters)
+        characters: List[str] = ["random", *_ALL_CHARACTERS_SORTED]
         return {
             "required": {
                 "Characters_from": (categories,),
@@ -79,46 +82,60 @@ class AnimeCharacterSelector:
             return (character,)
         
         # Handle random selection
-        possible_choices: List[str] = [c for c in CHARACTER_DATA_LOADED.get(Characters_from, []) if c != "random"]
-        if not possible_choices:
+        _ensure_loaded()
+        pool: List[str] = _NO_RANDOM.get(Characters_from, [])
+        if not pool:
             print(f"[ACS Warning]: No characters in '{Characters_from}'. Falling back to 'RANDOM'.")
-            possible_choices = [c for c in CHARACTER_DATA_LOADED.get("RANDOM", []) if c != "random"]
-            if not possible_choices:
+            pool = _NO_RANDOM.get("RANDOM", [])
+            if not pool:
                 print("[ACS Error]: No characters available.")
                 return ("Error: No characters available",)
         
-        # Avoid repeating the previous character if possible
-        potential_choices: List[str] = [c for c in possible_choices if c != self.previous_character] or possible_choices
-        final_character: str = random.choice(potential_choices)
+        # Avoid repeating the previous character if possible (pools are deduplicated, so this terminates)
+        final_character: str = self._rng.choice(pool)
+        while final_character == self.previous_character and len(pool) > 1:
+            final_character = self._rng.choice(pool)
         self.previous_character = final_character
         return (final_character,)
 
 def load_data() -> None:
     """Load character data from JSON or set error state."""
-    global CHARACTER_DATA_LOADED
+    global CHARACTER_DATA_LOADED, _ALL_CHARACTERS_SORTED, _NO_RANDOM
     json_file: str = os.path.join(JSON_FOLDER, "danbooru_chars_mp_sorted_top10p_no_multi.json")
     
     if not os.path.exists(json_file):
         print(f"[ACS Setup]: JSON file '{json_file}' not found.")
         CHARACTER_DATA_LOADED = {"Error": ["random", "Error: JSON Missing"]}
-        return
+        _ALL_CHARACTERS_SORTED = ("Error: JSON Missing",)
+    else:
+        try:
+            raw: bytes = Path(json_file).read_bytes()
+            CHARACTER_DATA_LOADED = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            print("[ACS Setup]: Character data loaded from JSON.")
+            
+            # Ensure "random" is first in each category and create "RANDOM" category
+            all_characters: Set[str] = set()
+            for category in CHARACTER_DATA_LOADED:
+                if CHARACTER_DATA_LOADED[category][0] != "random":
+                    CHARACTER_DATA_LOADED[category].insert(0, "random")
+                all_characters.update(c for c in CHARACTER_DATA_LOADED[category] if c != "random")
+            _ALL_CHARACTERS_SORTED = tuple(sorted(all_characters))
+            CHARACTER_DATA_LOADED["RANDOM"] = ["random", *_ALL_CHARACTERS_SORTED]
+            
+        except Exception as e:
+            print(f"[ACS Setup]: Error loading JSON: {e}")
+            CHARACTER_DATA_LOADED = {"Error": ["random", "Error: JSON Load Failed"]}
+            _ALL_CHARACTERS_SORTED = ("Error: JSON Load Failed",)
 
-    try:
-        with open(json_file, "r", encoding="utf-8") as f:
-            CHARACTER_DATA_LOADED = json.load(f)
-        print("[ACS Setup]: Character data loaded from JSON.")
-        
-        # Ensure "random" is first in each category and create "RANDOM" category
-        all_characters: Set[str] = set()
-        for category in CHARACTER_DATA_LOADED:
-            if CHARACTER_DATA_LOADED[category][0] != "random":
-                CHARACTER_DATA_LOADED[category].insert(0, "random")
-            all_characters.update(c for c in CHARACTER_DATA_LOADED[category] if c != "random")
-        CHARACTER_DATA_LOADED["RANDOM"] = ["random"] + sorted(all_characters)
-        
-    except Exception as e:
-        print(f"[ACS Setup]: Error loading JSON: {e}")
-        CHARACTER_DATA_LOADED = {"Error": ["random", "Error: JSON Load Failed"]}
+    # Per-category pools for random picks, without "random" and without duplicates
+    _NO_RANDOM = {category: list(dict.fromkeys(c for c in chars if c != "random")) for category, chars in CHARACTER_DATA_LOADED.items()}
+
+@lru_cache(maxsize=None)
+def _ensure_loaded() -> None:
+    """Load character data on first use instead of at import time."""
+    load_data()
 
-# Initialize on script load
-load_data()
\ No newline at end of file
+def _register_routes() -> None:
+    """Attach the API endpoint to the running PromptServer (called once by the package loader)."""
+    from server import PromptServer
+    PromptServer.instance.routes.get("/mira/get_character_data")(get_character_data_api)
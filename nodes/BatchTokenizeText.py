@@ -1,7 +1,7 @@
 class SplitTextByTokens:
     """
-    A ComfyUI node that splits input text into a list of strings, each not exceeding a maximum number of tokens
-    using a CLIP tokenizer. Outputs a Python list of strings. Requires a CLIP input for the tokenizer.
+    A ComfyUI node that splits comma-separated text (", ") into a list of strings, each holding at most
+    `max_tokens_per_chunk` comma-separated entries (tags). Outputs a Python list of strings.
     """
     @classmethod
     def INPUT_TYPES(cls) -> dict:
@@ -25,11 +25,11 @@ class SplitTextByTokens:
 
     def split_text(self, text: str, max_tokens_per_chunk: int) -> tuple[list[str]]:
         """
-        Splits text into chunks based on token count.
+        Splits text into chunks of at most `max_tokens_per_chunk` ", "-separated entries.
 
         Args:
             text: Input text to split.
-            max_tokens_per_chunk: Maximum tokens per chunk (before BOS/EOS).
+            max_tokens_per_chunk: Maximum entries per chunk.
 
         Returns:
             Tuple containing the list of text chunks.
@@ -37,13 +37,24 @@ class SplitTextByTokens:
         if not text or max_tokens_per_chunk <= 0:
             return ([],)
 
-        # Split text into chunks and join with commas
-        text_list: list[str] = text.split(", ")
-        chunks: list[str] = [
-            ", ".join(text_list[i:i + max_tokens_per_chunk])
-            for i in range(0, len(text_list), max_tokens_per_chunk)
-        ]
-        return (chunks,)
+        sep: str = ", "
+        sep_len: int = len(sep)
+        if text.count(sep) < max_tokens_per_chunk:
+            return ([text],)  # Fits in a single chunk
+
+        # Slice the original text at every max_tokens_per_chunk-th separator
+        # (same result as splitting on ", " and re-joining groups, without rebuilding strings)
+        chunks: list[str] = []
+        start: int = 0
+        while True:
+            end: int = start - sep_len
+            for _ in range(max_tokens_per_chunk):
+                end = text.find(sep, end + sep_len)
+                if end == -1:
+                    chunks.append(text[start:])
+                    return (chunks,)
+            chunks.append(text[start:end])
+            start = end + sep_len
 
 
 class GetTextListByIndex:
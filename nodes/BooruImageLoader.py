@@ -1,16 +1,97 @@
+import asyncio
+import concurrent.futures
+import io
+import itertools
+from collections import OrderedDict
 import os
-import tempfile
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from urllib3.util.retry import Retry
 import hashlib
+from email.utils import formatdate
+import shutil
 import random  # Added: Required for random mode selection
-from PIL import Image
-import numpy as np
-import torch
-from typing import List, Tuple, Dict, Optional
+import threading
+import time
+from typing import TYPE_CHECKING, List, Tuple, Dict, Optional
 
 import folder_paths
 import server
 
+if TYPE_CHECKING:  # torch/numpy/PIL are imported inside the methods that use them
+    import torch
+    from PIL import Image
+
+# Shared HTTP session: keeps TLS connections to the booru APIs/CDNs alive between calls
+_SESSION = requests.Session()
+_SESSION.headers.update({"User-Agent": "ComfyUI-BooruLoaderNode/1.0", "Connection": "keep-alive"})
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504), allowed_methods=frozenset({"GET"})),
+))
+
+# Revalidating a local cache hit must not stall the run: no retries, short (connect, read) timeouts,
+# and any failure falls back to the cached file
+_REVALIDATE_SESSION = requests.Session()
+_REVALIDATE_SESSION.headers.update(_SESSION.headers)
+_REVALIDATE_SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=0))
+_REVALIDATE_TIMEOUT = (3.05, 10)
+
+# Parsed URL/tag listings keyed by (website, tags, page) -> (expiry on time.monotonic(), results).
+# Shared by the node and the /booru-proxy route so a dropdown refresh or a random-mode run
+# within _URL_CACHE_TTL seconds reuses the previous API response.
+# Bounded as an LRU so long sessions browsing many tag/page combinations don't grow it forever.
+_URL_CACHE: "OrderedDict[Tuple[str, str, int], Tuple[float, List[Tuple[str, str]]]]" = OrderedDict()
+_URL_CACHE_TTL = 300.0
+_URL_CACHE_MAXSIZE = 128
+_URL_CACHE_LOCK = threading.Lock()  # Route handler and prompt worker run on different threads
+
+# Runs the Safebooru and Danbooru API calls side by side in combined mode (reused, threads start on demand)
+_FETCH_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="booru-fetch")
+
+_ALLOWED_EXTS = frozenset({".jpg", ".jpeg", ".png", ".gif", ".webp"})
+_DOWNLOAD_CHUNK_SIZE = 262144  # 256 KiB keeps per-chunk Python overhead low for multi-MB images
+
+def _pil_to_tensor(img: "Image.Image") -> Tuple["torch.Tensor", "torch.Tensor"]:
+    """Convert an RGB PIL image to a ComfyUI IMAGE batch [1, H, W, 3] and an all-ones MASK [1, H, W].
+
+    np.asarray reads PIL's buffer without an extra float copy; the uint8 -> float32 cast is the
+    only full-size allocation and the 1/255 scale is applied in place.
+    """
+    import numpy as np
+    import torch
+
+    tensor = torch.from_numpy(np.asarray(img, dtype=np.uint8)).to(torch.float32).mul_(1.0 / 255.0).unsqueeze_(0)
+    mask = torch.ones(tensor.shape[:3], dtype=tensor.dtype)
+    return tensor, mask
+
+def _decode_to_tensor(buf: bytes) -> Tuple["torch.Tensor", "torch.Tensor"]:
+    """Decode encoded image bytes straight to an IMAGE/MASK pair.
+
+    torchvision decodes JPEG/PNG/GIF/WEBP from the byte buffer without a PIL round trip;
+    anything it rejects (or an older torchvision without decode_image) goes through PIL.
+    """
+    import torch
+
+    try:
+        from torchvision.io import ImageReadMode, decode_image
+
+        decoded = decode_image(torch.frombuffer(bytearray(buf), dtype=torch.uint8), mode=ImageReadMode.RGB)
+    except (ImportError, RuntimeError):
+        from PIL import Image
+
+        return _pil_to_tensor(Image.open(io.BytesIO(buf)).convert("RGB"))
+
+    if decoded.dim() == 4:  # Animated GIF: [frames, C, H, W], keep the first frame like PIL does
+        decoded = decoded[0]
+    # torchvision >= 0.21 keeps 16-bit PNGs as uint16 (a dtype older torch builds do not have)
+    scale = 1.0 / 65535.0 if decoded.dtype == getattr(torch, "uint16", None) else 1.0 / 255.0
+    tensor = decoded.permute(1, 2, 0).contiguous().to(torch.float32).mul_(scale).unsqueeze_(0)
+    mask = torch.ones(tensor.shape[:3], dtype=tensor.dtype)
+    return tensor, mask
+
 class BooruImageLoader:
     """Loads images from Safebooru/Danbooru based on tags in selective or random mode, with optional local caching.
     
@@ -18,6 +99,9 @@ class BooruImageLoader:
     save_path is optional and dynamic: only required/visible when save_locally is True.
     """
 
+    def __init__(self) -> None:
+        self._rng = random.Random()  # Per-node RNG, independent of the global one
+
     @classmethod
     def INPUT_TYPES(cls):
         """Define input types. save_path is optional to support dynamic hiding in JS."""
@@ -48,31 +132,57 @@ class BooruImageLoader:
         return float("NaN")
 
     def _fetch_urls(self, website: str, tags: str, page: int) -> List[Tuple[str, str]]:
+        """Fetch image URLs and tags, reusing results cached within the last _URL_CACHE_TTL seconds (LRU-bounded)."""
+        key = (website, tags, page)
+        now = time.monotonic()
+        with _URL_CACHE_LOCK:
+            cached = _URL_CACHE.get(key)
+            if cached is not None and cached[0] > now:
+                _URL_CACHE.move_to_end(key)
+                return list(cached[1])
+
+        image_data = self._fetch_urls_uncached(website, tags, page)
+        if image_data:  # Don't cache errors/empty pages, so they are retried next time
+            with _URL_CACHE_LOCK:
+                for expired in [k for k, (expiry, _) in _URL_CACHE.items() if expiry <= now]:
+                    del _URL_CACHE[expired]
+                _URL_CACHE[key] = (now + _URL_CACHE_TTL, image_data)
+                _URL_CACHE.move_to_end(key)
+                while len(_URL_CACHE) > _URL_CACHE_MAXSIZE:
+                    _URL_CACHE.popitem(last=False)  # Evict least recently used
+        return list(image_data)
+
+    def _fetch_urls_uncached(self, website: str, tags: str, page: int) -> List[Tuple[str, str]]:
         """Fetch image URLs and tags from the specified booru website(s), deduplicating if combined."""
-        safebooru_data = self._fetch_safebooru(tags, page) if website in ["Safebooru", "Safebooru & Danbooru"] else []
-        danbooru_data = self._fetch_danbooru(tags, page) if website in ["Danbooru", "Safebooru & Danbooru"] else []
-        
         if website == "Safebooru":
-            return safebooru_data
+            return self._fetch_safebooru(tags, page)
         elif website == "Danbooru":
-            return danbooru_data
-        # Combine and deduplicate for dual mode
-        seen_urls = set()
-        combined = safebooru_data + danbooru_data
-        return [(url, tags_str) for url, tags_str in combined if not (url in seen_urls or seen_urls.add(url))]
+            return self._fetch_danbooru(tags, page)
+
+        # Query both APIs at once so combined mode costs one round trip, not two
+        safebooru_future = _FETCH_EXECUTOR.submit(self._fetch_safebooru, tags, page)
+        danbooru_future = _FETCH_EXECUTOR.submit(self._fetch_danbooru, tags, page)
+        safebooru_data, danbooru_data = safebooru_future.result(), danbooru_future.result()
+
+        # Combine and deduplicate for dual mode (first occurrence wins)
+        merged: Dict[str, str] = {}
+        for url, tags_str in itertools.chain(safebooru_data, danbooru_data):
+            merged.setdefault(url, tags_str)
+        return list(merged.items())
 
     def _fetch_safebooru(self, tags: str, page: int) -> List[Tuple[str, str]]:
         """Fetch URLs and tags from Safebooru API."""
         try:
             encoded_tags = tags.replace(',', '').replace(' ', '+')
             url = f"https://safebooru.org/index.php?page=dapi&s=post&q=index&json=1&tags={encoded_tags}&pid={page}"
-            response = requests.get(url, timeout=20)
+            response = _SESSION.get(url, timeout=20)
             response.raise_for_status()
             data = response.json()
             if not isinstance(data, list):
                 print(f"Safebooru: Unexpected data format for tags '{tags}' page {page}")
                 return []
-            return [(item["file_url"], item["tags"].replace(" ", ", ")) for item in data if item.get("file_url") and item.get("tags")]
+            return [(file_url, tag_str.replace(" ", ", ")) for item in data
+                    if (file_url := item.get("file_url")) and (tag_str := item.get("tags"))]
         except Exception as e:
             print(f"Safebooru: Error fetching for tags '{tags}': {e}")
             return []
@@ -83,44 +193,27 @@ class BooruImageLoader:
         encoded_tags = "+".join(tag_list[:2] if len(tag_list) > 2 else tag_list)
         try:
             url = f"https://danbooru.donmai.us/posts.json?limit=100&tags={encoded_tags}&page={page}"
-            headers = {"User-Agent": "ComfyUI-BooruLoaderNode/1.0"}
-            response = requests.get(url, headers=headers, timeout=20)
+            response = _SESSION.get(url, timeout=20)
             response.raise_for_status()
             data = response.json()
             if not isinstance(data, list):
                 print(f"Danbooru: Unexpected data format for tags '{tags}' page {page}")
                 return []
-            return [(item.get("large_file_url") or item["file_url"], item["tag_string"].replace(" ", ", "))
-                    for item in data if item.get("file_url") and item.get("tag_string") and not item.get("is_banned", False)]
+            return [(item.get("large_file_url") or file_url, tag_str.replace(" ", ", ")) for item in data
+                    if (file_url := item.get("file_url")) and (tag_str := item.get("tag_string")) and not item.get("is_banned", False)]
         except Exception as e:
             print(f"Danbooru: Error fetching for tags '{tags}': {e}")
             return []
 
-    def _create_error_image(self, color: str = "black", message: str = "") -> Tuple[torch.Tensor, torch.Tensor, str]:
+    def _create_error_image(self, color: str = "black", message: str = "") -> Tuple["torch.Tensor", "torch.Tensor", str]:
         """Generate a placeholder error image tensor with optional error message for tags output."""
-        img = Image.new("RGB", (64, 64), color)
-        img_np = np.array(img).astype(np.float32) / 255.0
-        tensor = torch.from_numpy(img_np)[None,]
-        mask = torch.ones_like(tensor[:, :, :, 0])
-        return tensor, mask, message
+        from PIL import Image
 
-    def _download_to_temp(self, url: str) -> str:
-        """Download image to a temporary file (path returned; file deleted after loading)."""
-        try:
-            headers = {"User-Agent": "ComfyUI-BooruLoaderNode/1.0"}
-            response = requests.get(url, headers=headers, stream=True, timeout=30)
-            response.raise_for_status()
-            suffix = os.path.splitext(url.split('?')[0])[1] or '.jpg'
-            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
-                for chunk in response.iter_content(8192):
-                    temp_file.write(chunk)
-                return temp_file.name
-        except Exception as e:
-            print(f"Temp download error for {url}: {e}")
-            raise
+        tensor, mask = _pil_to_tensor(Image.new("RGB", (64, 64), color))
+        return tensor, mask, message
 
     def load_image_from_booru(self, website: str, mode: str, tags: str, page_number: int, selected_image_url: str, save_locally: bool, save_path: Optional[str] = None, prompt: Optional[Dict] = None, extra_pnginfo: Optional[Dict] = None):
-        """Load image based on mode, handle temp/local saving, return tensor, mask, and tags.
+        """Load image based on mode, handle optional local saving, return tensor, mask, and tags.
         
         Handles optional save_path: Errors if save_locally=True but save_path missing/empty.
         """
@@ -142,7 +235,7 @@ class BooruImageLoader:
             if not image_data:
                 print(f"Booru Loader: No images found for tags '{tags}', page {page_number}, website {website}")
                 return self._create_error_image()
-            url, tags_str = random.choice(image_data)
+            url, tags_str = self._rng.choice(image_data)
         else:  # selective mode
             # Skip placeholders/invalids; expect JS-populated URL (possibly 'url|tags')
             if (not selected_image_url or 
@@ -160,47 +253,69 @@ class BooruImageLoader:
             print("Booru Loader: No valid URL determined")
             return self._create_error_image("red", "No URL available")
 
-        # Generate cache filename based on URL hash
-        filename_base = hashlib.sha256(url.encode()).hexdigest()[:16]
-        parsed_url = requests.utils.urlparse(url)
-        ext = os.path.splitext(parsed_url.path)[1].lower() or ".jpg"
-        if ext not in [".jpg", ".jpeg", ".png", ".gif", ".webp"]:
+        # Generate cache filename based on URL hash (non-cryptographic use; 8-byte BLAKE2b = 16 hex chars)
+        filename_base = hashlib.blake2b(url.encode(), digest_size=8).hexdigest()
+        ext = os.path.splitext(url.partition("?")[0].partition("#")[0])[1].lower()  # Unknown/host-only -> ".jpg" below
+        if ext not in _ALLOWED_EXTS:
             ext = ".jpg"
         filename = f"booru_{filename_base}{ext}"
         full_path = os.path.join(save_dir, filename) if save_locally else None
 
-        # Download/load image (to local or temp)
-        img_path = full_path
-        delete_after = not save_locally
-        img = None
+        # Download/load image (decoded from memory; raw bytes only written to the local cache)
         try:
-            if save_locally and os.path.exists(full_path):
-                # Load from cache
-                img = Image.open(full_path).convert("RGB")
-            else:
+            # Revalidate an existing cache file with a conditional GET instead of trusting it blindly
+            cached_mtime = None
+            if save_locally:
+                try:
+                    cached_mtime = os.stat(full_path).st_mtime
+                except FileNotFoundError:
+                    pass
+
+            if cached_mtime is None:
                 if save_locally:
                     print(f"Booru Loader: Downloading to local: {full_path}")
                 else:
-                    print(f"Booru Loader: Downloading to temp for {url}")
-                    img_path = self._download_to_temp(url)
-
-                # Perform download
-                headers = {"User-Agent": "ComfyUI-BooruLoaderNode/1.0"}
-                response = requests.get(url, headers=headers, stream=True, timeout=30)
-                response.raise_for_status()
-                with open(img_path, "wb") as f:
-                    for chunk in response.iter_content(8192):
-                        f.write(chunk)
-                img = Image.open(img_path).convert("RGB")
-
-            # Immediate cleanup for temp files
-            if delete_after and os.path.exists(img_path):
-                os.unlink(img_path)
-
-            # Convert to ComfyUI tensor format
-            img_np = np.array(img).astype(np.float32) / 255.0
-            tensor = torch.from_numpy(img_np)[None,]
-            mask = torch.ones_like(tensor[:, :, :, 0])
+                    print(f"Booru Loader: Downloading to memory for {url}")
+            headers = {"If-Modified-Since": formatdate(cached_mtime, usegmt=True)} if cached_mtime is not None else None
+
+            # Perform download (a 304 reply has no body; keep the cached file)
+            buf = None
+            session, timeout = (_SESSION, 30) if cached_mtime is None else (_REVALIDATE_SESSION, _REVALIDATE_TIMEOUT)
+            try:
+                with session.get(url, timeout=timeout, stream=True, headers=headers) as response:
+                    if response.status_code != 304:
+                        response.raise_for_status()
+                        response.raw.decode_content = True  # Undo any Content-Encoding like iter_content would
+                        with io.BytesIO() as body:
+                            shutil.copyfileobj(response.raw, body, _DOWNLOAD_CHUNK_SIZE)
+                            buf = body.getvalue()
+            except (requests.RequestException, Urllib3HTTPError) as e:  # raw reads raise urllib3's own errors
+                if cached_mtime is None:
+                    raise
+                print(f"Booru Loader: Could not revalidate {url} ({e}), using cached file")
+
+            if buf is None:
+                # Load from cache
+                with open(full_path, "rb") as f:
+                    buf = f.read()
+            elif save_locally:
+                if cached_mtime is not None:
+                    print(f"Booru Loader: Remote image changed, updating local: {full_path}")
+                # Write next to the target and rename, so an interrupted save never leaves a truncated cache hit
+                tmp_path = f"{full_path}.{os.getpid()}.part"
+                try:
+                    with open(tmp_path, "wb") as f:
+                        f.write(buf)
+                    os.replace(tmp_path, full_path)
+                except BaseException:
+                    try:
+                        os.unlink(tmp_path)
+                    except OSError:
+                        pass
+                    raise
+
+            # Decode to ComfyUI tensor format
+            tensor, mask = _decode_to_tensor(buf)
 
             # Embed metadata in PNG info if available
             if prompt and extra_pnginfo:
@@ -212,7 +327,7 @@ class BooruImageLoader:
                     "booru_query_tags": tags if mode == "random" else "N/A (Selective)",
                     "booru_query_page": page_number if mode == "random" else "N/A (Selective)",
                     "booru_save_locally": save_locally,
-                    "booru_save_path": save_path if save_locally else "Temporary (deleted)"
+                    "booru_save_path": save_path if save_locally else "Not saved"
                 }
                 extra_pnginfo.setdefault("workflow", {})["booru_loader_metadata"] = metadata
 
@@ -220,13 +335,9 @@ class BooruImageLoader:
             return tensor, mask, tags_str
 
         except Exception as e:
-            # Cleanup on error
-            if delete_after and img_path and os.path.exists(img_path):
-                os.unlink(img_path)
             print(f"Booru Loader: Error processing {url}: {e}")
             return self._create_error_image("red", f"Load error: {str(e)[:50]}")
 
-@server.PromptServer.instance.routes.get("/booru-proxy")
 async def get_booru_urls(request):
     """API endpoint for JS extension to fetch URL/tag list for dropdown population."""
     tags = request.query.get("tags", "")
@@ -240,10 +351,15 @@ async def get_booru_urls(request):
         return server.web.json_response({"status": "error", "values": ["Missing tags"]}, status=400)
 
     loader = BooruImageLoader()
-    image_data = loader._fetch_urls(website, tags, page)
+    # Blocking HTTP: run it on the default executor so the server's event loop keeps serving other requests
+    image_data = await asyncio.get_running_loop().run_in_executor(None, loader._fetch_urls, website, tags, page)
     if image_data:
         return server.web.json_response({
             "status": "success",
             "values": [{"url": url, "tags": tags_str} for url, tags_str in image_data]
         })
-    return server.web.json_response({"status": "info", "values": ["No results found"]})
\ No newline at end of file
+    return server.web.json_response({"status": "info", "values": ["No results found"]})
+
+def _register_routes() -> None:
+    """Attach the API endpoint to the running PromptServer (called once by the package loader)."""
+    server.PromptServer.instance.routes.get("/booru-proxy")(get_booru_urls)
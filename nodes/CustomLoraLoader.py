@@ -1,11 +1,22 @@
 import os
 import json
+import asyncio
+import atexit
+import threading
+import time
 from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import folder_paths
 import server
 import concurrent.futures
 
+try:
+    import orjson  # Optional: faster load/save of the keywords cache
+except ImportError:
+    orjson = None
+
 # ---- Global Configuration for JSON Path ----
 
 # Global configuration
@@ -16,6 +27,16 @@ JSON_FOLDER: Path = Path(os.path.join(str(Path(__file__).parent.parent.resolve()
 JSON_FILE = JSON_FOLDER / "lora_keywords.json"
 
 
+# Shared HTTP session: paginated Civitai searches reuse one kept-alive TLS connection per worker
+_SESSION = requests.Session()
+_SESSION.headers.update({"User-Agent": "ComfyUI-LoraLoaderAndKeywords/1.0", "Connection": "keep-alive"})
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504), allowed_methods=frozenset({"GET"})),
+))
+
+
 # ---- JSON Cache Management ----
 
 def load_keywords_from_json():
@@ -26,23 +47,73 @@ def load_keywords_from_json():
             json.dump({}, f)
         return {}
     try:
-        with open(JSON_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, UnicodeDecodeError):
+        raw = JSON_FILE.read_bytes()
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError):  # orjson.JSONDecodeError subclasses json's
         return {}
 
 def save_keywords_to_json(data):
-    """Saves the keywords dictionary to the JSON file."""
-    with open(JSON_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    """Saves the keywords dictionary to the JSON file (via a temp file + rename, so it is never left half-written).
+
+    Both writers produce the same layout (2-space indent, UTF-8), whether or not orjson is installed.
+    """
+    tmp_file = JSON_FILE.with_suffix(".json.tmp")
+    if orjson is not None:
+        tmp_file.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, JSON_FILE)
 
 # In-memory cache to reduce disk reads during a session
 LORA_KEYWORDS_CACHE = load_keywords_from_json()
 
+# Debounced persistence: the cache is written after FLUSH_EVERY updates, at most FLUSH_INTERVAL seconds after
+# the first unsaved update (timer), and at exit
+FLUSH_EVERY = 8
+FLUSH_INTERVAL = 5.0
+_cache_lock = threading.Lock()  # Guards LORA_KEYWORDS_CACHE writes and the dirty counter
+_save_lock = threading.Lock()   # Serializes disk writes (they share one temp file)
+_dirty_count = 0
+_last_flush_ts = time.monotonic()
+_flush_timer = None  # Deferred flush armed by the first unsaved update
+
+def _flush_now():
+    """Writes pending cache updates to disk, if any."""
+    global _dirty_count, _last_flush_ts, _flush_timer
+    with _save_lock:
+        with _cache_lock:
+            if _flush_timer is not None:
+                _flush_timer.cancel()
+                _flush_timer = None
+            _last_flush_ts = time.monotonic()
+            if not _dirty_count:
+                return
+            snapshot = dict(LORA_KEYWORDS_CACHE)  # Serialize a copy: lookups keep updating the live dict
+            _dirty_count = 0
+        save_keywords_to_json(snapshot)
+
+def _maybe_flush(lora_name, entry):
+    """Stores one cache update and flushes once enough updates or time have accumulated."""
+    global _dirty_count, _flush_timer
+    with _cache_lock:
+        LORA_KEYWORDS_CACHE[lora_name] = entry
+        _dirty_count += 1
+        due = _dirty_count >= FLUSH_EVERY or time.monotonic() - _last_flush_ts > FLUSH_INTERVAL
+        if not due and _flush_timer is None:
+            # Make sure a quiet period still gets written (atexit doesn't run on SIGTERM/SIGKILL)
+            _flush_timer = threading.Timer(FLUSH_INTERVAL, _flush_now)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+    if due:
+        _flush_now()
+
+atexit.register(_flush_now)
+
 
 # ---- Civitai API Search Worker ----
 
-def search_civitai_paginated(lora_stem: str, query: str, model_type: str):
+def search_civitai_paginated(lora_stem: str, query: str, model_type: str, cancel_event=None):
     """
     Performs a paginated search on the Civitai API for a specific model type.
 
@@ -50,18 +121,20 @@ def search_civitai_paginated(lora_stem: str, query: str, model_type: str):
         lora_stem (str): The filename stem of the LoRA to match.
         query (str): The search query string.
         model_type (str): The model type to search for ('LORA' or 'LoCon').
+        cancel_event (threading.Event, optional): Stops paginating once set (the other search won).
 
     Returns:
         list: A list of found trigger words, or None if not found or on error.
     """
-    session = requests.Session()
     base_url = f"https://civitai.com/api/v1/models?limit=25&query={query}&types={model_type}&nsfw=true"
     print(base_url)
     current_page_url = base_url
 
     while current_page_url:
+        if cancel_event is not None and cancel_event.is_set():
+            return None # Another search already found the keywords
         try:
-            response = session.get(current_page_url, timeout=30)
+            response = _SESSION.get(current_page_url, timeout=30)
             response.raise_for_status()
             data = response.json()
         except requests.exceptions.RequestException as e:
@@ -75,7 +148,8 @@ def search_civitai_paginated(lora_stem: str, query: str, model_type: str):
         for model in items:
             for version in model.get('modelVersions', []):
                 for file_info in version.get('files', []):
-                    if Path(file_info.get('name', '')).stem == lora_stem:
+                    name = file_info.get('name', '')
+                    if (name.rpartition('.')[0] or name) == lora_stem:  # Same as Path(name).stem for bare filenames
                         print(f"Match found for '{lora_stem}' in type '{model_type}'!")
                         return version.get('trainedWords', [])
 
@@ -87,19 +161,58 @@ def search_civitai_paginated(lora_stem: str, query: str, model_type: str):
 
 # ---- Main Fetch Logic with Multithreading ----
 
+# Shared worker pool for Civitai searches (two per LoRA: LORA and LoCon), reused across requests
+_CIVITAI_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix="civitai")
+
+# Searches currently running, keyed by lora_name, so concurrent requests for one LoRA share a single search
+_INFLIGHT = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+def _is_final(cached_data):
+    """Whether a cache entry can be returned as is (present and not an error marked for retry)."""
+    return cached_data is not None and not (isinstance(cached_data, dict) and cached_data.get("retry"))
+
 def fetch_triggers_for_lora(lora_name: str):
     """
-    Queries the Civitai API in parallel for 'LORA' and 'LoCon' types with pagination.
+    Returns the trigger words for a LoRA from the cache, or searches Civitai for them.
+    Concurrent calls for the same LoRA wait on the search already in progress.
     """
-    global LORA_KEYWORDS_CACHE
-    
     cached_data = LORA_KEYWORDS_CACHE.get(lora_name)
-    if cached_data is not None:
-        if isinstance(cached_data, dict) and cached_data.get("retry"):
-            print(f"Retrying keyword search for '{lora_name}' due to a previous error.")
+    if _is_final(cached_data):
+        return cached_data
+
+    with _INFLIGHT_LOCK:
+        inflight = _INFLIGHT.get(lora_name)
+        if inflight is None:
+            # Re-check under the lock: a search that finished after the read above has already
+            # stored its result (the owner caches before leaving _INFLIGHT)
+            cached_data = LORA_KEYWORDS_CACHE.get(lora_name)
+            if _is_final(cached_data):
+                return cached_data
+            inflight = _INFLIGHT[lora_name] = concurrent.futures.Future()
+            is_owner = True
         else:
-            return cached_data
+            is_owner = False
+    if not is_owner:
+        return inflight.result()
+    if cached_data is not None:
+        print(f"Retrying keyword search for '{lora_name}' due to a previous error.")
 
+    try:
+        found_words = search_triggers_for_lora(lora_name)
+        inflight.set_result(found_words)
+        return found_words
+    except BaseException as e:
+        inflight.set_exception(e)
+        raise
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(lora_name, None)
+
+def search_triggers_for_lora(lora_name: str):
+    """
+    Queries the Civitai API in parallel for 'LORA' and 'LoCon' types with pagination.
+    """
     print(f"Searching keywords for '{lora_name}' on Civitai (parallel search for LORA & LoCon)...")
     
     lora_stem = Path(lora_name).stem
@@ -112,18 +225,23 @@ def fetch_triggers_for_lora(lora_name: str):
     match_found_with_empty_keywords = False
     model_types_to_search = ["LORA", "LoCon"]
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-        future_to_type = {
-            executor.submit(search_civitai_paginated, lora_stem, query, m_type): m_type
-            for m_type in model_types_to_search
-        }
+    cancel_event = threading.Event()
+    pending = {
+        _CIVITAI_EXECUTOR.submit(search_civitai_paginated, lora_stem, query, m_type, cancel_event)
+        for m_type in model_types_to_search
+    }
 
-        for future in concurrent.futures.as_completed(future_to_type):
+    while pending and not found_words:
+        done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in done:
             result = future.result()
             # Cas 1 : Résultat trouvé avec des mots-clés (liste non vide)
             if result: 
                 found_words = result
-                executor.shutdown(wait=False, cancel_futures=True)
+                # Stop the other search between pages; the shared executor keeps serving other LoRAs
+                cancel_event.set()
+                for other in pending:
+                    other.cancel()
                 break
             # Cas 2 : Résultat trouvé mais la liste est vide ([])
             elif result is not None:
@@ -132,26 +250,24 @@ def fetch_triggers_for_lora(lora_name: str):
     # NOUVELLE LOGIQUE DE MISE EN CACHE AMÉLIORÉE
     if found_words:
         print(f"Keywords found for '{lora_name}': {found_words}")
-        LORA_KEYWORDS_CACHE[lora_name] = found_words
+        entry = found_words
     elif match_found_with_empty_keywords:
         print(f"No Keywords found for '{lora_name}', but a match was found. Caching empty list.")
-        LORA_KEYWORDS_CACHE[lora_name] = [] # On sauvegarde une liste vide, pas une erreur !
-        found_words = []
+        entry = found_words = [] # On sauvegarde une liste vide, pas une erreur !
     else:
         print(f"Civitai API ERROR or no match found for '{lora_name}'. Caching error for retry.")
-        error_info = {"error": "API search failed or no match found after full search.", "retry": True}
-        LORA_KEYWORDS_CACHE[lora_name] = error_info
+        entry = {"error": "API search failed or no match found after full search.", "retry": True}
         found_words = [] # On retourne une liste vide à l'UI pour éviter de bloquer
 
-    save_keywords_to_json(LORA_KEYWORDS_CACHE)
+    _maybe_flush(lora_name, entry)
     return found_words
 
 # ---- API Endpoint for JavaScript ----
 
-@server.PromptServer.instance.routes.get("/lora_keywords/{lora_name}")
 async def get_lora_keywords_endpoint(request):
     lora_name = request.match_info['lora_name']
-    keywords = fetch_triggers_for_lora(lora_name)
+    # Civitai lookups block on HTTP: keep them off the server's event loop
+    keywords = await asyncio.get_running_loop().run_in_executor(None, fetch_triggers_for_lora, lora_name)
     return server.web.json_response(keywords)
 
 
@@ -183,4 +299,9 @@ class LoraLoaderAndKeywords:
         
         lora_stack.append((lora_name, lora_strength, lora_strength))
         
-        return (lora_stack, trigger_word)
\ No newline at end of file
+        return (lora_stack, trigger_word)
+
+
+def _register_routes():
+    """Attach the API endpoint to the running PromptServer (called once by the package loader)."""
+    server.PromptServer.instance.routes.get("/lora_keywords/{lora_name}")(get_lora_keywords_endpoint)
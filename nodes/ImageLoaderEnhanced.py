@@ -7,31 +7,145 @@ import folder_paths
 from aiohttp import web
 import server
 import hashlib
+import io
+import json
 import shutil
 
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB  # Optional: SIMD JPEG decoding via libjpeg-turbo
+    _TURBO_JPEG = TurboJPEG()
+except Exception:  # Package not installed or libturbojpeg not found
+    _TURBO_JPEG = None
+
+_JPEG_EXTS = frozenset(('.jpg', '.jpeg'))
+_EXIF_ORIENTATION_TAG = 0x0112
+
+# EXIF orientation -> ndarray (H, W, C) view reproducing ImageOps.exif_transpose
+_EXIF_ORIENTATION_OPS = {
+    2: lambda a: a[:, ::-1],                        # FLIP_LEFT_RIGHT
+    3: lambda a: a[::-1, ::-1],                     # ROTATE_180
+    4: lambda a: a[::-1],                           # FLIP_TOP_BOTTOM
+    5: lambda a: a.transpose(1, 0, 2),              # TRANSPOSE
+    6: lambda a: np.rot90(a, k=-1),                 # ROTATE_270
+    7: lambda a: a[::-1, ::-1].transpose(1, 0, 2),  # TRANSVERSE
+    8: lambda a: np.rot90(a, k=1),                  # ROTATE_90
+}
+
+# Directory listings cached per path and validated by the directory's mtime, so repeat
+# INPUT_TYPES / IS_CHANGED / API calls don't rescan unchanged folders.
+_IMAGE_LIST_CACHE = {}  # dir path -> (st_mtime_ns, image filenames)
+_SUBDIR_CACHE = {}  # base dir -> ({dir path: st_mtime_ns} for every dir in the tree, relative subdir paths)
+
+def _to_unit_float(pixels):
+    """Scale integer pixel data into a new float32 tensor in [0, 1] in one pass (no intermediate copy)."""
+    out = torch.empty(pixels.shape, dtype=torch.float32)
+    np.multiply(pixels, np.float32(1.0 / 255.0), out=out.numpy(), casting='unsafe')
+    return out
+
+# Alpha byte -> mask value (1 - a/255), so the inverted mask is produced in one lookup pass
+_ALPHA_TO_MASK = np.subtract(1.0, np.arange(256, dtype=np.float32) / np.float32(255.0), dtype=np.float32)
+
+def _iter_images(path):
+    """Yield the names of image files directly inside `path` (DirEntry type info avoids extra stats)."""
+    with os.scandir(path) as it:
+        for entry in it:
+            name = entry.name
+            dot = name.rfind('.')
+            if dot > 0 and name[dot:].lower() in _IMAGE_EXT_SET and entry.is_file():
+                yield name
+
+def _list_images(path):
+    """Return the image filenames directly inside `path` (cached until the directory changes)."""
+    mtime = os.stat(path).st_mtime_ns
+    cached = _IMAGE_LIST_CACHE.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = _IMAGE_LIST_CACHE[path] = (mtime, tuple(_iter_images(path)))
+    return list(cached[1])
+
+_FILE_HASH_CACHE = {}  # file path -> ((st_mtime_ns, st_size), sha256 hex digest)
+
+def _file_sha256(path):
+    """SHA-256 of a file, streamed in fixed-size chunks and reused while its mtime/size are unchanged."""
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _FILE_HASH_CACHE.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        else:
+            h = hashlib.sha256()
+            buf = memoryview(bytearray(1 << 18))
+            while n := f.readinto(buf):
+                h.update(buf[:n])
+            digest = h.hexdigest()
+    _FILE_HASH_CACHE[path] = (key, digest)
+    return digest
+
+def _tree_unchanged(dir_mtimes):
+    """True if every directory of a previously walked tree still has the recorded mtime."""
+    try:
+        return all(os.stat(path).st_mtime_ns == mtime for path, mtime in dir_mtimes.items())
+    except OSError:
+        return False
+
+def _list_subdirectories(base):
+    """Return every subdirectory of `base` as a '/'-separated relative path (cached until the tree changes).
+
+    Adding or removing a folder bumps its parent's mtime, so re-statting the known directories is
+    enough to detect changes without walking the tree again.
+    """
+    cached = _SUBDIR_CACHE.get(base)
+    if cached is not None and _tree_unchanged(cached[0]):
+        return cached[1]
+    dir_mtimes = {}
+    subdirs = []
+    for dirpath, dirnames, _ in os.walk(base):
+        try:
+            dir_mtimes[dirpath] = os.stat(dirpath).st_mtime_ns
+        except OSError:
+            continue
+        subdirs.extend(os.path.relpath(os.path.join(dirpath, dirname), base).replace(os.sep, "/") for dirname in dirnames)
+    result = tuple(subdirs)
+    _SUBDIR_CACHE[base] = (dir_mtimes, result)
+    return result
+
+_INPUT_DIR = None
+_OUTPUT_DIR = None
+
+def _dirs():
+    """ComfyUI's input and output directories, looked up once (they are fixed after startup)."""
+    global _INPUT_DIR, _OUTPUT_DIR
+    if _INPUT_DIR is None:
+        _INPUT_DIR, _OUTPUT_DIR = folder_paths.get_input_directory(), folder_paths.get_output_directory()
+    return _INPUT_DIR, _OUTPUT_DIR
+
+_DIRECTORY_CHOICES = None  # (subdirectory listings it was built from, sorted choices)
+
+def _directory_choices(input_dir, output_dir):
+    """Sorted "directory" choices: [INPUT], [OUTPUT] and every subfolder of both (rebuilt only when a tree changes)."""
+    global _DIRECTORY_CHOICES
+    subdirs = (_list_subdirectories(input_dir), _list_subdirectories(output_dir))
+    if _DIRECTORY_CHOICES is None or _DIRECTORY_CHOICES[0] != subdirs:
+        _DIRECTORY_CHOICES = (subdirs, sorted({"[INPUT]", "[OUTPUT]"}.union(*subdirs)))
+    return _DIRECTORY_CHOICES[1]
+
 class ImageLoaderEnhanced:
     """Enhanced image loader for selecting and processing images from directories."""
     
     IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.bmp', '.gif', '.tiff')
+    HASH_FILE_CONTENTS = False  # Opt-in: hash the selected file (SHA-256) instead of using its size/mtime as change token
 
     @classmethod
     def INPUT_TYPES(cls):
         """Define input types for the node, including directories and file selection modes."""
-        input_dir, output_dir = folder_paths.get_input_directory(), folder_paths.get_output_directory()
+        input_dir, output_dir = _dirs()
         files = folder_paths.filter_files_content_types(os.listdir(input_dir), ["image"])
         
-        directories = ["[INPUT]", "[OUTPUT]"]
-        for base, prefix in [(input_dir, ""), (output_dir, "")]:
-            directories.extend(
-                rel_path.replace(os.sep, "/")
-                for dirpath, dirnames, _ in os.walk(base)
-                for dirname in dirnames
-                if (rel_path := os.path.relpath(os.path.join(dirpath, dirname), base)) != "."
-            )
-        
         return {
             "required": {
-                "directory": (sorted(set(directories)), {"default": "[INPUT]"}),
+                "directory": (list(_directory_choices(input_dir, output_dir)), {"default": "[INPUT]"}),
                 "mode": (["Random", "Filename"], {"default": "Filename"}),
                 "filename": (sorted(files), {"image_upload": True}),
             }
@@ -46,23 +160,29 @@ class ImageLoaderEnhanced:
     def load_image(self, directory, mode, filename):
         """Load and process an image based on directory, mode, and filename."""
         # Resolve directory path
-        input_dir, output_dir = folder_paths.get_input_directory(), folder_paths.get_output_directory()
+        input_dir, output_dir = _dirs()
         full_dir_path, subfolder = self._get_dir_path(directory, input_dir, output_dir)
         
         if not os.path.exists(full_dir_path):
             raise FileNotFoundError(f"Directory not found: {full_dir_path}")
         
         # Get and validate image files
-        image_files = [f for f in os.listdir(full_dir_path) if f.lower().endswith(self.IMAGE_EXTENSIONS)]
+        image_files = _list_images(full_dir_path)
         if not image_files:
             raise FileNotFoundError(f"No valid image files found in: {full_dir_path}")
         
         # Select image
         selected_file = random.choice(image_files) if mode == "Random" else self._validate_filename(filename, image_files, full_dir_path)
         
-        # Load and process image
-        img = ImageOps.exif_transpose(Image.open(os.path.join(full_dir_path, selected_file)))
-        image_tensor, mask = self._process_image(img)
+        # Load and process image (JPEGs through libjpeg-turbo when available, everything else through PIL)
+        image_path = os.path.join(full_dir_path, selected_file)
+        result = None
+        if _TURBO_JPEG is not None and os.path.splitext(selected_file)[1].lower() in _JPEG_EXTS:
+            result = self._load_jpeg_turbo(image_path)
+        if result is None:
+            img = ImageOps.exif_transpose(Image.open(image_path))
+            result = self._process_image(img)
+        image_tensor, mask = result
         
         # Determine image type for UI
         image_type = "input" if full_dir_path.startswith(input_dir) else "output"
@@ -89,23 +209,51 @@ class ImageLoaderEnhanced:
             raise FileNotFoundError(f"File '{filename}' not found in: {dir_path}")
         return filename
 
+    def _load_jpeg_turbo(self, path):
+        """Decode a JPEG straight to an RGB ndarray with TurboJPEG; None if it can't (e.g. CMYK), so PIL takes over."""
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            rgb = _TURBO_JPEG.decode(data, pixel_format=TJPF_RGB)
+            with Image.open(io.BytesIO(data)) as probe:  # Header only: reads EXIF without decoding pixels
+                orientation = probe.getexif().get(_EXIF_ORIENTATION_TAG, 1)
+        except Exception:
+            return None
+        if orientation in _EXIF_ORIENTATION_OPS:
+            rgb = np.ascontiguousarray(_EXIF_ORIENTATION_OPS[orientation](rgb))
+        h, w = rgb.shape[:2]
+        image_tensor = _to_unit_float(rgb).unsqueeze_(0)
+        return image_tensor, torch.zeros((1, h, w), dtype=torch.float32)  # JPEG has no alpha
+
     def _process_image(self, img):
         """Convert image to tensor and create mask."""
         w, h = img.size
-        image = img.convert("RGB")
         if img.mode == 'I':
-            image = img.point(lambda i: i * (1 / 255))
+            # 16/32-bit integer images: scale into 8-bit range first, then expand to RGB
+            image = img.point(lambda i: i * (1 / 255)).convert("RGB")
+        elif img.mode != "RGB":
+            image = img.convert("RGB")
+        else:
+            image = img  # Already RGB: no copy
         
-        image_np = np.array(image).astype(np.float32) / 255.0
-        image_tensor = torch.from_numpy(image_np)[None,]
+        image_tensor = _to_unit_float(np.asarray(image, dtype=np.uint8)).unsqueeze_(0)
         
-        if 'A' in img.getbands() or (img.mode == 'P' and 'transparency' in img.info):
-            mask = np.array(img.convert('RGBA').getchannel('A')).astype(np.float32) / 255.0
-            mask = 1. - torch.from_numpy(mask)
+        # Take the alpha plane directly when the mode has one (RGBA, LA, PA); only palette transparency needs a convert
+        if 'A' in img.getbands():
+            alpha = img.getchannel('A')
+        elif img.mode == 'P' and 'transparency' in img.info:
+            alpha = img.convert('RGBA').getchannel('A')
+        else:
+            alpha = None
+
+        if alpha is not None:
+            mask = torch.empty((h, w), dtype=torch.float32)
+            np.take(_ALPHA_TO_MASK, np.asarray(alpha, dtype=np.uint8), out=mask.numpy())
+            mask = mask.unsqueeze_(0)
         else:
-            mask = torch.zeros((w, h), dtype=torch.float32, device="cpu")
+            mask = torch.zeros((1, h, w), dtype=torch.float32)
         
-        return image_tensor, mask.unsqueeze(0)
+        return image_tensor, mask
 
     @classmethod
     def IS_CHANGED(cls, directory, mode, filename):
@@ -114,12 +262,15 @@ class ImageLoaderEnhanced:
         if not os.path.exists(full_dir_path):
             return True
         
-        image_files = [f for f in os.listdir(full_dir_path) if f.lower().endswith(cls.IMAGE_EXTENSIONS)]
+        image_files = _list_images(full_dir_path)
         if mode == "Filename" and filename not in image_files:
             return True
         if mode == "Filename":
-            with open(os.path.join(full_dir_path, filename), 'rb') as f:
-                return hashlib.sha256(f.read()).hexdigest()
+            file_path = os.path.join(full_dir_path, filename)
+            if cls.HASH_FILE_CONTENTS:
+                return _file_sha256(file_path)
+            st = os.stat(file_path)
+            return f"{st.st_size}:{st.st_mtime_ns}"
         return random.random()
 
     @classmethod
@@ -129,7 +280,7 @@ class ImageLoaderEnhanced:
         if not os.path.exists(full_dir_path):
             return f"Directory not found: {full_dir_path}"
         if mode == "Filename":
-            image_files = [f for f in os.listdir(full_dir_path) if f.lower().endswith(cls.IMAGE_EXTENSIONS)]
+            image_files = _list_images(full_dir_path)
             if not filename:
                 return "Filename must be specified in Filename mode."
             if filename not in image_files:
@@ -139,30 +290,44 @@ class ImageLoaderEnhanced:
     @staticmethod
     def _resolve_dir_path(directory):
         """Resolve directory path for validation and change detection."""
-        input_dir, output_dir = folder_paths.get_input_directory(), folder_paths.get_output_directory()
+        input_dir, output_dir = _dirs()
         if directory == "[INPUT]":
             return input_dir
         if directory == "[OUTPUT]":
             return output_dir
         return os.path.join(input_dir, directory) if os.path.exists(os.path.join(input_dir, directory)) else os.path.join(output_dir, directory)
 
-@server.PromptServer.instance.routes.get("/ril/get_directories")
-async def get_directories(_):
+# Lowercase extensions accepted by _iter_images (single source: the class attribute)
+_IMAGE_EXT_SET = frozenset(ImageLoaderEnhanced.IMAGE_EXTENSIONS)
+
+# Serialized API responses: route key -> (listing they were built from, ETag, JSON body)
+_RESPONSE_CACHE = {}
+
+def _cached_json_response(request, key, source, build):
+    """JSON response with an ETag, reusing the serialized body while `source` is unchanged.
+
+    The browser revalidates on every poll (Cache-Control: no-cache) and gets an empty 304 when
+    its If-None-Match still matches.
+    """
+    cached = _RESPONSE_CACHE.get(key)
+    if cached is None or cached[0] != source:
+        body = json.dumps(build())
+        etag = f'"{hashlib.blake2b(body.encode(), digest_size=8).hexdigest()}"'
+        cached = _RESPONSE_CACHE[key] = (source, etag, body)
+    _, etag, body = cached
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("If-None-Match") == etag:
+        return web.Response(status=304, headers=headers)
+    return web.Response(text=body, content_type="application/json", headers=headers)
+
+async def get_directories(request):
     """API endpoint to fetch available directories."""
     try:
-        directories = ["[INPUT]", "[OUTPUT]"]
-        for base in [folder_paths.get_input_directory(), folder_paths.get_output_directory()]:
-            directories.extend(
-                rel_path.replace(os.sep, "/")
-                for dirpath, dirnames, _ in os.walk(base)
-                for dirname in dirnames
-                if (rel_path := os.path.relpath(os.path.join(dirpath, dirname), base)) != "."
-            )
-        return web.json_response(sorted(set(directories)))
+        directories = _directory_choices(*_dirs())
+        return _cached_json_response(request, "directories", directories, lambda: directories)
     except Exception as e:
         return web.json_response({"error": str(e)}, status=500)
 
-@server.PromptServer.instance.routes.post("/ril/ensure_input_preview")
 async def ensure_input_preview(request):
     """Ensure a copy of the selected image exists in INPUT root for preview.
 
@@ -178,8 +343,7 @@ async def ensure_input_preview(request):
         if not filename:
             return web.json_response({"error": "Missing filename"}, status=400)
 
-        input_dir = folder_paths.get_input_directory()
-        output_dir = folder_paths.get_output_directory()
+        input_dir, output_dir = _dirs()
 
         # Determine source path
         if image_type == "input":
@@ -196,8 +360,11 @@ async def ensure_input_preview(request):
 
         created = False
         if not os.path.exists(dest_path):
-            # Copy file to INPUT root with the same name
-            shutil.copy2(src_path, dest_path)
+            # Hardlink into INPUT root when on the same filesystem (no bytes copied), else copy
+            try:
+                os.link(src_path, dest_path)
+            except OSError:
+                shutil.copy2(src_path, dest_path)
             created = True
 
         return web.json_response({
@@ -207,12 +374,11 @@ async def ensure_input_preview(request):
     except Exception as e:
         return web.json_response({"error": str(e)}, status=500)
 
-@server.PromptServer.instance.routes.get("/ril/get_filenames")
 async def get_filenames(request):
     """API endpoint to fetch image filenames in a directory."""
     directory = request.query.get("directory", "")
     try:
-        input_dir, output_dir = folder_paths.get_input_directory(), folder_paths.get_output_directory()
+        input_dir, output_dir = _dirs()
         # Resolve full path, subfolder and image type (input/output)
         if directory == "[INPUT]":
             full_path = input_dir
@@ -236,11 +402,21 @@ async def get_filenames(request):
         if not os.path.exists(full_path):
             return web.json_response({"error": f"Directory not found: {full_path}"}, status=404)
         
-        image_files = [f for f in os.listdir(full_path) if f.lower().endswith(ImageLoaderEnhanced.IMAGE_EXTENSIONS)]
-        return web.json_response({
-            "filenames": sorted(image_files),
-            "subfolder": subfolder,
-            "type": image_type
-        })
+        image_files = tuple(_list_images(full_path))
+        return _cached_json_response(
+            request, ("filenames", directory), (full_path, image_type, image_files),
+            lambda: {
+                "filenames": sorted(image_files),
+                "subfolder": subfolder,
+                "type": image_type
+            },
+        )
     except Exception as e:
-        return web.json_response({"error": str(e)}, status=500)
\ No newline at end of file
+        return web.json_response({"error": str(e)}, status=500)
+
+def _register_routes():
+    """Attach the API endpoints to the running PromptServer (called once by the package loader)."""
+    routes = server.PromptServer.instance.routes
+    routes.get("/ril/get_directories")(get_directories)
+    routes.post("/ril/ensure_input_preview")(ensure_input_preview)
+    routes.get("/ril/get_filenames")(get_filenames)
@@ -1,5 +1,21 @@
+import operator
+import os
+import numpy as np
 import torch
 
+# Per-evaluation logging is opt-in: set ALCAI_DEBUG=1 to print gate inputs/results
+_DEBUG = bool(os.environ.get("ALCAI_DEBUG"))
+
+# Logic gate mode -> operation, built once instead of evaluating every gate per call
+_GATE_OPS = {
+    "AND": lambda a, b: a and b,
+    "OR": lambda a, b: a or b,
+    "XOR": operator.xor,
+    "NAND": lambda a, b: not (a and b),
+    "NOR": lambda a, b: not (a or b),
+    "XNOR": operator.eq,
+}
+
 class AnyType(str):
     """A class that always equals any value in comparisons."""
     def __eq__(self, _): return True
@@ -37,16 +53,9 @@ class LogicGatesForBoolean:
         Returns:
             tuple: Single boolean result.
         """
-        operations = {
-            "AND": boolean_a and boolean_b,
-            "OR": boolean_a or boolean_b,
-            "XOR": boolean_a ^ boolean_b,
-            "NAND": not (boolean_a and boolean_b),
-            "NOR": not (boolean_a or boolean_b),
-            "XNOR": boolean_a == boolean_b
-        }
-        result = operations[mode]
-        print(f"LogicGate: {boolean_a} {mode} {boolean_b} = {result}")
+        result = _GATE_OPS[mode](boolean_a, boolean_b)
+        if _DEBUG:
+            print(f"LogicGate: {boolean_a} {mode} {boolean_b} = {result}")
         return (result,)
 
 class LogicGateForAnyValue:
@@ -71,13 +80,23 @@ class LogicGateForAnyValue:
         Returns:
             tuple: (value if truthy else None, is_truthy).
         """
-        is_truthy = value.numel() > 0 if isinstance(value, torch.Tensor) else bool(value)
+        # Arrays count as truthy when non-empty: size/numel only read metadata (no device sync,
+        # and bool() on a multi-element array would raise)
+        if value is None:
+            is_truthy = False
+        elif isinstance(value, torch.Tensor):
+            is_truthy = value.numel() > 0
+        elif isinstance(value, np.ndarray):
+            is_truthy = value.size > 0
+        else:
+            is_truthy = bool(value)
         result = value if is_truthy else None
-        print(f"PassValueIfTruthy: Input '{value}' (type: {type(value)}) is {'truthy' if is_truthy else 'falsy'}. Output: {result}")
+        if _DEBUG:
+            print(f"PassValueIfTruthy: Input '{value}' (type: {type(value)}) is {'truthy' if is_truthy else 'falsy'}. Output: {result}")
         return (result, is_truthy)
     
 class LogicGateSwitchForAnyValue:
-    """A ComfyUI node that passes truthy values or None for falsy values."""
+    """A ComfyUI node that outputs one of two values depending on a boolean."""
     
     @classmethod
     def INPUT_TYPES(cls):
@@ -90,8 +109,14 @@ class LogicGateSwitchForAnyValue:
     CATEGORY = "Logic"
 
     def evaluate_condition(self, value_if_true, value_if_false, boolean):
-        if value_if_true and value_if_false:
-            if boolean:
-                return (value_if_true,)
-            else:
-                return(value_if_false,)
\ No newline at end of file
+        """Select value_if_true or value_if_false.
+
+        Args:
+            value_if_true (any): Output when boolean is True.
+            value_if_false (any): Output when boolean is False.
+            boolean (bool): Selector.
+
+        Returns:
+            tuple: The selected value.
+        """
+        return (value_if_true if boolean else value_if_false,)
\ No newline at end of file
@@ -41,13 +41,11 @@ class LoraNameSelector:
         """
         Retrieves the filename for the selected model and its base name.
         """
-        # The 'ckpt_name' input variable already holds the exact filename string
-        # that the CheckpointLoader node requires. We just need to pass it through.
-        selected_filename = lora
-        selected_filename = folder_paths.get_full_path_or_raise("loras", selected_filename)
-        
+        # Only resolve the selected LoRA when it is actually used; randomize picks from the (cached) list instead
         if randomize:
             selected_filename = random.choice(folder_paths.get_filename_list("loras"))
+        else:
+            selected_filename = folder_paths.get_full_path_or_raise("loras", lora)
 
         # Calculate the base name without the extension
         # os.path.splitext splits "model.safetensors" into ("model", ".safetensors")
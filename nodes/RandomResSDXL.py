@@ -2,8 +2,22 @@ import torch
 import random
 import math
 from fractions import Fraction
+from functools import lru_cache
 from typing import Tuple
 
+@lru_cache(maxsize=256)
+def _aspect_ratio_str(width: int, height: int) -> str:
+    """Simplified "w/h" aspect ratio string (denominator at most 100).
+
+    Exact ratios with a small denominator (16/9, 3/2, 1/1, ...) come straight from the gcd;
+    only unusual sizes need the Fraction approximation. Memoized per input size.
+    """
+    divisor = math.gcd(width, height)
+    if height // divisor <= 100:
+        return f"{width // divisor}/{height // divisor}"
+    simplified_ratio = Fraction(width / height).limit_denominator(100)
+    return f"{simplified_ratio.numerator}/{simplified_ratio.denominator}"
+
 class RandomResSDXL:
     """
     Computes the aspect ratio of an image and generates random dimensions (width, height)
@@ -42,23 +56,28 @@ class RandomResSDXL:
         Returns:
             Tuple of (width, height, aspect_ratio_str) with rounded dimensions and simplified aspect ratio.
         """
+        # Only the dimensions are needed; .size(dim) returns plain ints
+        return self.calculate_for_size(image.size(2), image.size(1), ratio_mode, min_total_pixels, max_total_pixels, step_multiple, seed)
+
+    @classmethod
+    def calculate_for_size(cls, width_in: int, height_in: int, ratio_mode: str, min_total_pixels: int, max_total_pixels: int, step_multiple: int, seed: int) -> Tuple[int, int, str]:
+        """
+        Same as calculate_random_dimensions, from an input width/height instead of an image tensor.
+        """
         # Ensure min_total_pixels <= max_total_pixels
         min_total_pixels = min(min_total_pixels, max_total_pixels)
 
-        # Get input dimensions
-        _, height_in, width_in, _ = image.shape
         if height_in == 0 or width_in == 0:
             print(f"[ERROR] RandomResSDXL: Invalid dimensions ({width_in}x{height_in}). Returning defaults.")
             return (512, 512, "1/1")
 
         # Calculate and simplify aspect ratio
         aspect_ratio: float = width_in / height_in
-        simplified_ratio: Fraction = Fraction(aspect_ratio).limit_denominator(100)
-        aspect_ratio_str: str = f"{simplified_ratio.numerator}/{simplified_ratio.denominator}"
+        aspect_ratio_str: str = _aspect_ratio_str(width_in, height_in)
 
-        # Set random seed and choose target area
-        random.seed(seed)
-        target_area: float = random.uniform(min_total_pixels, max_total_pixels)
+        # Seeded local RNG (same sequence as seeding the global one, without touching global state)
+        rng = random.Random(seed)
+        target_area: float = rng.uniform(min_total_pixels, max_total_pixels)
 
         # Calculate ideal dimensions
         ideal_height: float = math.sqrt(target_area / aspect_ratio)
@@ -80,7 +99,7 @@ class RandomResSDXL:
         if ratio_mode == "Any":
             # This handles the "Any" case
             choices = [(new_width, new_height), (new_height, new_width)]
-            final_width, final_height = random.choice(choices)
+            final_width, final_height = rng.choice(choices)
             print(f"[INFO] RandomResSDXL: {ratio_mode} output, resolution: {final_width}x{final_height}")
         elif ratio_mode == "Image":
             # For image, width should be the longer side
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 import numpy as np
 import torch
 from PIL import Image, ImageDraw, ImageFont
@@ -15,21 +16,16 @@ color_mapping = {
     "brown": (165, 42, 42), "gray": (128, 128, 128), "light_gray": (211, 211, 211), "dark_gray": (169, 169, 169)
 }
 
-def tensor2pil(image_tensor):
-    """Convert torch tensor to PIL Image."""
-    if image_tensor.ndim == 4: image_tensor = image_tensor[0]
-    return Image.fromarray((image_tensor.cpu().numpy() * 255).astype(np.uint8), 'RGB')
-
 def reduce_opacity(img, opacity):
     """Reduce image opacity."""
     if img.mode != 'RGBA': img = img.convert('RGBA')
-    alpha = img.split()[3].point(lambda p: p * opacity)
+    alpha = img.getchannel('A').point(bytes(round(p * opacity) for p in range(256)))  # 256-entry LUT, no per-pixel callback
     img.putalpha(alpha)
     return img
 
-def get_color_values(color_name, color_hex, mapping):
-    """Get RGB tuple from color name or hex."""
-    if color_name != "Hex": return mapping.get(color_name, (0, 0, 0))
+@lru_cache(maxsize=128)
+def _parse_hex(color_hex):
+    """Parse #RGB/#RRGGBB/#RRGGBBAA into an RGB tuple; black (with a warning) if invalid."""
     try:
         hex_color = color_hex.lstrip('#')
         if len(hex_color) in (6, 8): return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
@@ -39,14 +35,77 @@ def get_color_values(color_name, color_hex, mapping):
         print(f"Warning: Could not parse hex color {color_hex}. Using black.")
     return (0, 0, 0)
 
+def get_color_values(color_name, color_hex, mapping):
+    """Get RGB tuple from color name or hex."""
+    return mapping.get(color_name, (0, 0, 0)) if color_name != "Hex" else _parse_hex(color_hex)
+
+# Alignment -> top-left corner of the text box: f(img_width, img_height, text_width, text_height, x_margin, y_margin)
+_ALIGN_POSITIONS = {
+    "center": lambda W, H, tw, th, xm, ym: ((W - tw) // 2, (H - th) // 2),
+    "top left": lambda W, H, tw, th, xm, ym: (xm, ym),
+    "top center": lambda W, H, tw, th, xm, ym: ((W - tw) // 2, ym),
+    "top right": lambda W, H, tw, th, xm, ym: (W - tw - xm, ym),
+    "bottom left": lambda W, H, tw, th, xm, ym: (xm, H - th - ym),
+    "bottom center": lambda W, H, tw, th, xm, ym: ((W - tw) // 2, H - th - ym),
+    "bottom right": lambda W, H, tw, th, xm, ym: (W - tw - xm, H - th - ym),
+}
+
+_FONT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "fonts")
+
+@lru_cache(maxsize=32)
+def _load_font(font_path, font_size):
+    """Load a TrueType/OpenType font once per (path, size), falling back to Arial, then PIL's default font."""
+    try:
+        return ImageFont.truetype(font_path, font_size)
+    except Exception:
+        try:
+            return ImageFont.truetype("arial.ttf", font_size)
+        except Exception:
+            return ImageFont.load_default()
+
+@lru_cache(maxsize=1)
+def _list_fonts(dir_mtime_ns):
+    """Font files in _FONT_DIR; the directory mtime is the cache key, so added/removed fonts show up."""
+    with os.scandir(_FONT_DIR) as entries:
+        return tuple(e.name for e in entries if e.name.lower().endswith((".ttf", ".otf")))
+
+# Shared 1x1 canvas for text measurement (textbbox only reads the font, never the pixels)
+_MEASURE_DRAW = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+
+@lru_cache(maxsize=16)
+def _render_sprite(font_path, font_size, text, outline_width, fill, stroke_fill, opacity_q):
+    """Measure the text and rasterize it into a tight RGBA sprite; opacity_q is opacity in 1/255 steps.
+
+    Returns:
+        tuple: (sprite, text_width, text_height) with sprite as read-only uint8 [h, w, 4] (4 bytes per pixel cached).
+    """
+    font = _load_font(font_path, font_size)
+    try:
+        # Single-line text can be measured on the font directly; multiline layout needs ImageDraw
+        bbox = font.getbbox(text, stroke_width=outline_width) if "\n" not in text else \
+            _MEASURE_DRAW.textbbox((0, 0), text, font=font, stroke_width=outline_width)
+        text_width, text_height = bbox[2] - bbox[0], bbox[3] - bbox[1]
+        offset_x, offset_y = bbox[0], bbox[1]
+    except (AttributeError, TypeError):  # Older Pillow / bitmap fallback font without bbox+stroke support
+        ascent, descent = font.getmetrics()
+        text_width, text_height = int(font.getlength(text)), ascent + descent
+        offset_x, offset_y = 0, 0
+
+    sprite = Image.new("RGBA", (max(1, text_width), max(1, text_height)), (0, 0, 0, 0))
+    ImageDraw.Draw(sprite).text((-offset_x, -offset_y), text, font=font, fill=fill,
+                                stroke_width=outline_width, stroke_fill=stroke_fill)
+    if opacity_q < 255: sprite = reduce_opacity(sprite, opacity_q / 255.0)
+    sprite_np = np.array(sprite, dtype=np.uint8)
+    sprite_np.setflags(write=False)  # Shared between runs through the cache
+    return sprite_np, text_width, text_height
+
 class CustomWatermarkMaker:
     """A ComfyUI node to overlay text watermarks on images with customizable alignment, font, and outline."""
 
     @classmethod
     def INPUT_TYPES(cls):
         """Define input types for the node."""
-        font_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "fonts")
-        file_list = [f for f in os.listdir(font_dir) if f.lower().endswith((".ttf", ".otf"))] if os.path.isdir(font_dir) else ["default"]
+        file_list = list(_list_fonts(os.stat(_FONT_DIR).st_mtime_ns)) if os.path.isdir(_FONT_DIR) else ["default"]
         ALIGN_OPTIONS = ["center", "top left", "top center", "top right", "bottom left", "bottom center", "bottom right"]
         return {
             "required": {
@@ -95,55 +154,56 @@ class CustomWatermarkMaker:
         Returns:
             tuple: A single-element tuple containing the output image tensor.
         """
+        # Nothing would be drawn (or no frames to draw on): pass the batch through untouched
+        if opacity <= 0.0 or not text or image.shape[0] == 0:
+            return (image,)
+
         # Get RGBA colors
         text_color_rgba = get_color_values(font_color, font_color_hex, color_mapping) + (255,)
         outline_color_rgba = get_color_values(outline_color, outline_color_hex, color_mapping) + (255,)
 
-        # Load font
-        font_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "fonts")
-        font_path = os.path.join(font_dir, font_name)
-        try:
-            font = ImageFont.truetype(font_path, font_size)
-        except Exception:
-            try:
-                font = ImageFont.truetype("arial.ttf", font_size)
-            except Exception:
-                font = ImageFont.load_default()
-
-        total_images = []
-        for img_tensor in image:
-            img_pil = tensor2pil(img_tensor)
-            draw = ImageDraw.Draw(textlayer := Image.new("RGBA", img_pil.size, (0, 0, 0, 0)))
-
-            # Calculate text bounding box
-            try:
-                bbox = draw.textbbox((0, 0), text, font=font, stroke_width=outline_width)
-                text_width, text_height = bbox[2] - bbox[0], bbox[3] - bbox[1]
-                offset_x, offset_y = bbox[0], bbox[1]
-            except AttributeError:
-                ascent, descent = font.getmetrics()
-                text_width, text_height = font.getlength(text), ascent + descent
-                offset_x, offset_y = 0, 0
-
-            # Determine text position
-            img_width, img_height = img_pil.size
-            x, y = {
-                "center": ((img_width - text_width) // 2, (img_height - text_height) // 2),
-                "top left": (x_margin, y_margin),
-                "top center": ((img_width - text_width) // 2, y_margin),
-                "top right": (img_width - text_width - x_margin, y_margin),
-                "bottom left": (x_margin, img_height - text_height - y_margin),
-                "bottom center": ((img_width - text_width) // 2, img_height - text_height - y_margin),
-                "bottom right": (img_width - text_width - x_margin, img_height - text_height - y_margin)
-            }.get(align, ((img_width - text_width) // 2, (img_height - text_height) // 2))
-
-            # Draw text with outline
-            draw.text((x - offset_x, y - offset_y), text, font=font, fill=text_color_rgba, 
-                     stroke_width=outline_width, stroke_fill=outline_color_rgba)
-
-            # Apply opacity and composite
-            if opacity < 1.0: textlayer = reduce_opacity(textlayer, opacity)
-            out_image_pil = Image.alpha_composite(img_pil.convert("RGBA"), textlayer).convert("RGB")
-            total_images.append(torch.from_numpy(np.array(out_image_pil).astype(np.float32) / 255.0).unsqueeze(0))
-
-        return (torch.cat(total_images, 0) if total_images else torch.empty((0, 1, 1, 3)),)
\ No newline at end of file
+        # Font file (loaded and cached inside _render_sprite)
+        font_path = os.path.join(_FONT_DIR, font_name)
+
+        # Render the watermark once (cached across runs; alpha is 8-bit, so opacity is keyed in 1/255 steps)
+        opacity_q = min(255, round(opacity * 255))
+        sprite_np, text_width, text_height = _render_sprite(font_path, font_size, text, outline_width,
+                                                            text_color_rgba, outline_color_rgba, opacity_q)
+        sprite_height, sprite_width = sprite_np.shape[:2]
+
+        # Determine text position (ComfyUI batches share one frame size)
+        img_height, img_width = image.shape[1:3]
+        position = _ALIGN_POSITIONS.get(align, _ALIGN_POSITIONS["center"])
+        x, y = position(img_width, img_height, text_width, text_height, x_margin, y_margin)
+
+        # Watermark lies entirely outside the frame: nothing to blend, skip the batch copy
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + sprite_width, img_width), min(y + sprite_height, img_height)
+        if x1 <= x0 or y1 <= y0:
+            return (image,)
+
+        # Only the visible part of the sprite is converted to float
+        visible = sprite_np[y0 - y:y1 - y, x0 - x:x1 - x].astype(np.float32)
+        visible *= np.float32(1.0 / 255.0)
+
+        # GPU batches: upload the small sprite once and blend on the device, no host round trip for the frames
+        if image.device.type != "cpu":
+            out = image.detach().clone()
+            sprite_t = torch.from_numpy(visible).to(device=image.device, dtype=image.dtype)
+            out[:, y0:y1, x0:x1].lerp_(sprite_t[..., :3], sprite_t[..., 3:4])
+            return (out,)
+
+        # One copy of the whole batch (never modify the input); device move and cast happen in a single torch op
+        frames = image.detach().to("cpu", torch.float32, copy=True).numpy()
+
+        # Alpha-blend the visible part of the sprite into every frame at once: dst += (src - dst) * a
+        dst = frames[:, y0:y1, x0:x1]
+        src_rgb, src_alpha = visible[..., :3], visible[..., 3:4]
+        tmp = np.empty(src_rgb.shape, dtype=np.float32)  # Single scratch buffer reused for every frame
+        for frame in dst:
+            np.subtract(src_rgb, frame, out=tmp)
+            tmp *= src_alpha
+            frame += tmp
+
+        # Hand the result back in the input's dtype (no-op for float32 batches)
+        return (torch.from_numpy(frames).to(dtype=image.dtype),)
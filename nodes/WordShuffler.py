@@ -4,6 +4,8 @@ import random
 class WordShuffler:
     """A ComfyUI node to shuffle word order in a string. Words are split by spaces or commas."""
     
+    _SPLIT_RE = re.compile(r'\s*,\s*|\s+')  # Word separators: a comma with optional spaces, or whitespace
+
     @classmethod
     def INPUT_TYPES(cls):
         """Define input types for the node."""
@@ -38,6 +40,7 @@ class WordShuffler:
             return (text,)
         
         # Split by ", " or multiple spaces, filter out empty strings, shuffle, and join
-        words = [w for w in re.split(r'\s*,\s*|\s+', text.strip()) if w]
-        random.shuffle(words)
-        return (", ".join(words),)
\ No newline at end of file
+        words = list(filter(None, self._SPLIT_RE.split(text.strip())))
+        if len(words) < 2:
+            return (", ".join(words),)
+        return (", ".join(random.sample(words, len(words))),)
\ No newline at end of file